@@ -1,12 +1,83 @@
 import logging
+import multiprocessing as mp
 import os
+import signal
+import threading
 import time
+from collections import Counter
 from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from document_assessor.criteria import CriteriaConfig, run_all_checks_for_document
 from document_assessor.models import Document, DocumentBatch
-from document_assessor.utils import export_metrics, log_result
+from document_assessor.utils import (
+    export_metrics,
+    log_result,
+    setup_worker_logging,
+    start_worker_log_listener,
+)
+
+# Heavy modules imported once by the forkserver template process, so each
+# worker forked from it starts with them already loaded.
+FORKSERVER_PRELOAD = [
+    "cv2",
+    "numpy",
+    "pymupdf",
+    "PIL.Image",
+    "document_assessor.criteria",
+]
+
+
+def _get_mp_context():
+    """
+    Returns a forkserver context where the platform supports it, falling back
+    to the default start method otherwise (e.g. spawn on Windows).
+    """
+    if "forkserver" not in mp.get_all_start_methods():
+        return None
+    ctx = mp.get_context("forkserver")
+    ctx.set_forkserver_preload(FORKSERVER_PRELOAD)
+    return ctx
+
+
+class EvaluationTimeout(BaseException):
+    """
+    Raised by the SIGALRM handler when a document overruns its time budget.
+    Derives from BaseException so the per-page ``except Exception`` handlers
+    in the file handlers cannot swallow it and carry on with fewer pages.
+    """
+
+
+# Criteria list handed to each worker process once by the pool initializer,
+# rather than pickled alongside every submitted document.
+_worker_criteria: List[CriteriaConfig] = []
+
+
+def _init_worker(
+    criteria_list: List[CriteriaConfig], log_queue, log_level: int
+) -> None:
+    global _worker_criteria
+    _worker_criteria = criteria_list
+    # Worker processes do not inherit the parent's logging setup; send their
+    # records to the parent instead of opening log files of their own.
+    if mp.parent_process() is not None:
+        setup_worker_logging(log_queue, log_level)
+
+
+def _evaluate_with_worker_criteria(
+    doc: Document, timeout_seconds: int
+) -> Tuple[bool, List[str], List[str]]:
+    return evaluate_document_worker(doc, _worker_criteria, timeout_seconds)
+
+
+def _restore_timer(previous: Tuple[float, float], elapsed: float) -> None:
+    """
+    Re-arms the ITIMER_REAL timer that was paused for an evaluation, less the
+    time the evaluation took. A timer that fell due meanwhile fires at once.
+    """
+    delay, interval = previous
+    if delay > 0:
+        signal.setitimer(signal.ITIMER_REAL, max(delay - elapsed, 1e-6), interval)
 
 
 def evaluate_document_worker(
@@ -20,20 +91,54 @@ def evaluate_document_worker(
     if not doc.requiresOCR:
         return True, [], []
 
-    start_time = time.time()
+    started = time.monotonic()
+    deadline = started + timeout_seconds
+    timeout_msg = (
+        f"Evaluation for {doc.documentID} exceeded timeout of {timeout_seconds}s"
+    )
 
-    try:
-        is_accepted, reasons, warnings = run_all_checks_for_document(
-            doc.documentPath, doc.documentFormat, criteria_list
-        )
+    # Workers are separate single-threaded processes, so a SIGALRM can abort
+    # an evaluation that overruns instead of only being noticed afterwards.
+    use_alarm = (
+        hasattr(signal, "setitimer")
+        and threading.current_thread() is threading.main_thread()
+        and timeout_seconds > 0
+    )
+    if use_alarm:
+
+        def _on_timeout(signum, frame):
+            raise EvaluationTimeout(timeout_msg)
+
+        # Pause any timer the caller armed before swapping handlers, so it
+        # cannot fire into ours; it is re-armed once we are done.
+        previous_timer = signal.setitimer(signal.ITIMER_REAL, 0)
+        previous_handler = signal.signal(signal.SIGALRM, _on_timeout)
 
-        if time.time() - start_time > timeout_seconds:
-            logging.warning(
-                f"Evaluation for {doc.documentID} exceeded timeout of {timeout_seconds}s"
+    try:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+        try:
+            is_accepted, reasons, warnings = run_all_checks_for_document(
+                doc.documentPath, doc.documentFormat, criteria_list
             )
+        finally:
+            # Disarmed while still inside the outer try, so a late alarm is
+            # caught below instead of escaping the worker.
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+
+        if time.monotonic() > deadline:
+            # Without an alarm the overrun is only noticed here; the result is
+            # still rejected so it does not depend on the platform.
+            logging.warning(timeout_msg)
+            return False, [timeout_msg], []
 
         return is_accepted, reasons, warnings
 
+    except EvaluationTimeout:
+        logging.warning(timeout_msg)
+        return False, [timeout_msg], []
+
     except Exception as e:
         error_msg = f"Unexpected error during evaluation: {str(e)}"
         logging.error(
@@ -42,6 +147,11 @@ def evaluate_document_worker(
         )
         return False, [error_msg], []
 
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous_handler)
+            _restore_timer(previous_timer, time.monotonic() - started)
+
 
 def run_pipeline(
     data: List[dict], criteria_list: List[CriteriaConfig], timeout_per_doc: int = 60
@@ -49,13 +159,20 @@ def run_pipeline(
     """
     Runs the evaluation pipeline in parallel, ensuring results and logs are correctly handled.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
         validated_data = [DocumentBatch.model_validate(item) for item in data]
         all_docs = {
             doc.documentID: doc for batch in validated_data for doc in batch.documents
         }
 
+        # Documents pointing at the same file are evaluated once and the
+        # result is fanned out to every documentID in the bucket.
+        doc_buckets: Dict[Tuple[str, Optional[str], bool], List[str]] = {}
+        for doc_id, doc in all_docs.items():
+            key = (doc.documentPath, doc.documentFormat, doc.requiresOCR)
+            doc_buckets.setdefault(key, []).append(doc_id)
+
         metrics: Dict[str, Any] = {
             "total_docs": 0,
             "accepted_docs": 0,
@@ -63,65 +180,79 @@ def run_pipeline(
             "rejection_summary": {},
             "rejected_documents": [],
         }
+        rejection_summary: Counter = Counter()
 
-        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
-            future_to_doc_id = {
-                executor.submit(
-                    evaluate_document_worker, doc, criteria_list, timeout_per_doc
-                ): doc_id
-                for doc_id, doc in all_docs.items()
-            }
+        mp_context = _get_mp_context()
+        log_queue = (mp_context or mp.get_context()).Queue()
+        log_listener = start_worker_log_listener(log_queue)
 
-            logging.info(
-                f"Submitted {len(all_docs)} documents to ProcessPoolExecutor with {os.cpu_count() or 1} workers."
-            )
+        try:
+            with ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=mp_context,
+                initializer=_init_worker,
+                initargs=(criteria_list, log_queue, logging.getLogger().level),
+            ) as executor:
+                future_to_doc_ids = {
+                    executor.submit(
+                        _evaluate_with_worker_criteria,
+                        all_docs[doc_ids[0]],
+                        timeout_per_doc,
+                    ): doc_ids
+                    for doc_ids in doc_buckets.values()
+                }
+
+                logging.info(
+                    f"Submitted {len(doc_buckets)} unique documents (out of {len(all_docs)}) to ProcessPoolExecutor with {os.cpu_count() or 1} workers."
+                )
+
+                for future in as_completed(future_to_doc_ids):
+                    for doc_id in future_to_doc_ids[future]:
+                        doc_obj = all_docs[doc_id]
+                        try:
+                            is_accepted, reasons, warnings = future.result()
+
+                            log_result(doc_id, is_accepted, reasons, warnings)
+
+                            doc_obj.isAccepted = is_accepted
+                            doc_obj.reasons = reasons
+                            doc_obj.warnings = warnings
+
+                            metrics["total_docs"] += 1
+                            if is_accepted:
+                                metrics["accepted_docs"] += 1
+                            else:
+                                metrics["rejected_docs"] += 1
+                                metrics["rejected_documents"].append(
+                                    {"documentID": doc_id, "reasons": reasons}
+                                )
+                                rejection_summary.update(reasons)
+
+                        # EvaluationTimeout is a BaseException; a worker can
+                        # still raise it if the alarm lands outside its try.
+                        except (Exception, EvaluationTimeout) as exc:
+                            logging.error(
+                                f"Document {doc_id} generated a critical exception in the future: {exc}",
+                                exc_info=True,
+                            )
+                            reasons = [f"Critical processing error: {str(exc)}"]
+                            doc_obj.isAccepted = False
+                            doc_obj.reasons = reasons
 
-            for future in as_completed(future_to_doc_id):
-                doc_id = future_to_doc_id[future]
-                doc_obj = all_docs[doc_id]
-                try:
-                    is_accepted, reasons, warnings = future.result()
-
-                    log_result(doc_id, is_accepted, reasons, warnings)
-
-                    doc_obj.isAccepted = is_accepted
-                    doc_obj.reasons = reasons
-                    doc_obj.warnings = warnings
-
-                    metrics["total_docs"] += 1
-                    if is_accepted:
-                        metrics["accepted_docs"] += 1
-                    else:
-                        metrics["rejected_docs"] += 1
-                        metrics["rejected_documents"].append(
-                            {"documentID": doc_id, "reasons": reasons}
-                        )
-                        for r in reasons:
-                            metrics["rejection_summary"][r] = (
-                                metrics["rejection_summary"].get(r, 0) + 1
+                            metrics["total_docs"] += 1
+                            metrics["rejected_docs"] += 1
+                            metrics["rejected_documents"].append(
+                                {"documentID": doc_id, "reasons": reasons}
                             )
+                            rejection_summary.update(reasons)
+        finally:
+            log_listener.stop()
+            log_queue.close()
 
-                except Exception as exc:
-                    logging.error(
-                        f"Document {doc_id} generated a critical exception in the future: {exc}",
-                        exc_info=True,
-                    )
-                    reasons = [f"Critical processing error: {str(exc)}"]
-                    doc_obj.isAccepted = False
-                    doc_obj.reasons = reasons
-
-                    metrics["total_docs"] += 1
-                    metrics["rejected_docs"] += 1
-                    metrics["rejected_documents"].append(
-                        {"documentID": doc_id, "reasons": reasons}
-                    )
-                    for r in reasons:
-                        metrics["rejection_summary"][r] = (
-                            metrics["rejection_summary"].get(r, 0) + 1
-                        )
+        metrics["rejection_summary"] = dict(rejection_summary)
 
         logging.info(
-            f"All documents processed in {time.time() - start_time:.2f} seconds."
+            f"All documents processed in {time.perf_counter() - start_time:.2f} seconds."
         )
 
         from datetime import datetime
@@ -1,12 +1,11 @@
 import logging
 import time
-from io import BytesIO
 
-import psutil
 import pymupdf
 from PIL import Image
 
 from ..utils import (
+    get_current_process,
     get_file_size_mb,
     get_image_info,
     log_resource_usage,
@@ -14,9 +13,10 @@ from ..utils import (
 )
 
 
-def _page_to_image_bytes(doc, page_num: int, dpi: int, logging, monitor) -> bytes:
+def _render_page(doc, page_num: int, dpi: int, logging, monitor) -> Image.Image:
     """
-    Loads a single page, converts it to PNG bytes, and handles logging.
+    Loads a single page and renders it straight into a grayscale image,
+    skipping the RGB pixmap and the PNG encode/decode round-trip.
     By isolating this logic, large objects (`page`, `pix`) are scoped locally
     and garbage collected automatically when the function returns.
     """
@@ -25,24 +25,29 @@ def _page_to_image_bytes(doc, page_num: int, dpi: int, logging, monitor) -> byte
 
     # Get page dimensions for resource analysis
     page_rect = page.rect
-    expected_pixmap_size_mb = (
-        page_rect.width * page_rect.height * 4 * (dpi / 72) ** 2
-    ) / (1024 * 1024)
+    expected_pixmap_size_mb = (page_rect.width * page_rect.height * (dpi / 72) ** 2) / (
+        1024 * 1024
+    )
     logging.info(
         f"Page {page_num + 1} dimensions: {page_rect.width:.1f} x {page_rect.height:.1f}, Expected pixmap size: {expected_pixmap_size_mb:.2f} MB"
     )
 
-    # Create pixmap with specified DPI
-    pix = page.get_pixmap(dpi=dpi)
+    # Create a single-channel pixmap with specified DPI
+    pix = page.get_pixmap(dpi=dpi, colorspace=pymupdf.csGRAY)
     logging.info(f"Pixmap created for page {page_num + 1}")
 
     # Sample memory after pixmap creation
     monitor.sample(f"after_pixmap_{page_num + 1}")
 
-    img_bytes = pix.tobytes("png")
-    logging.info(f"PNG bytes extracted for page {page_num + 1}")
-
-    return img_bytes
+    img = Image.frombytes(
+        "L", (pix.width, pix.height), pix.samples_mv, "raw", "L", pix.stride
+    )
+    # Keep the render resolution as metadata, as a decoded PNG would carry it
+    img.info["dpi"] = (pix.xres, pix.yres)
+    # Page width in points, so DPI can be derived later without reopening
+    # the file
+    img.info["page_width_pt"] = page_rect.width
+    return img
 
 
 def get_images_from_pdf(
@@ -70,11 +75,7 @@ def get_images_from_pdf(
                         logging.info(f"Processing page {page_num + 1}...")
                         monitor.sample(f"before_page_{page_num + 1}")
 
-                        img_bytes = _page_to_image_bytes(
-                            doc, page_num, dpi, logging, monitor
-                        )
-
-                        img = Image.open(BytesIO(img_bytes)).convert("L")
+                        img = _render_page(doc, page_num, dpi, logging, monitor)
                         logging.info(f"PIL image created for page {page_num + 1}")
 
                         img_info = get_image_info(img)
@@ -102,8 +103,9 @@ def get_images_from_pdf(
                 f"PDF processing completed, extracted {len(images)} images, Total image size: {total_image_size_mb:.3f} MB"
             )
 
-            current_memory = psutil.Process().memory_info().rss / 1024 / 1024
-            current_cpu = psutil.Process().cpu_percent()
+            process = get_current_process()
+            current_memory = process.memory_info().rss / 1024 / 1024
+            current_cpu = process.cpu_percent()
             log_resource_usage(
                 f"pdf_complete_dpi_{dpi}",
                 current_memory,
@@ -1,15 +1,19 @@
-import gc
+from typing import Iterator
 
 from PIL import Image
 
 from document_assessor.utils import logging
 
 
-def get_images_from_tiff(path: str) -> list[Image.Image]:
+def get_images_from_tiff(path: str) -> Iterator[Image.Image]:
+    """
+    Lazily yields the frames of a TIFF file as grayscale images, so only one
+    decoded frame needs to be resident at a time.
+    """
     img = None
     try:
         img = Image.open(path)
-        images = []
+        extracted = 0
 
         # Limit the number of frames to prevent memory issues
         max_frames = min(img.n_frames, 20)  # Hard limit of 20 frames
@@ -18,12 +22,6 @@ def get_images_from_tiff(path: str) -> list[Image.Image]:
             try:
                 img.seek(i)
                 frame = img.convert("L")
-                images.append(frame)
-
-                # Clean up frame to free memory
-                frame = None
-                gc.collect()
-
             except Exception as frame_error:
                 logging.warning(f"Error processing frame {i + 1}: {frame_error}")
                 # For testing purposes, raise the exception if it's a specific test error
@@ -33,10 +31,11 @@ def get_images_from_tiff(path: str) -> list[Image.Image]:
                     raise frame_error
                 continue
 
-        if not images:
-            logging.warning(f"No frames extracted from TIFF: {path}")
+            extracted += 1
+            yield frame
 
-        return images
+        if not extracted:
+            logging.warning(f"No frames extracted from TIFF: {path}")
 
     except Exception as e:
         logging.error(f"TIFF processing failed: {e}")
@@ -44,5 +43,3 @@ def get_images_from_tiff(path: str) -> list[Image.Image]:
     finally:
         if img:
             img.close()
-        # Force garbage collection
-        gc.collect()
@@ -8,7 +8,7 @@ from document_assessor.utils import get_logger, load_json, save_json
 
 
 def main():
-    # Setup logging and get logger
+    # Logging is configured from the app config on first get_logger call
     logger = get_logger("main")
 
     parser = argparse.ArgumentParser(description="B-02 Quality Evaluation Module")
@@ -24,7 +24,7 @@ def main():
     )
     args = parser.parse_args()
 
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     try:
         logger.info(f"Starting document quality assessment...")
@@ -53,7 +53,7 @@ def main():
         logger.info("Saving results...")
         save_json(processed_data, args.output)
 
-        elapsed_time = time.time() - start_time
+        elapsed_time = time.perf_counter() - start_time
         logger.info(f"Processing completed in {elapsed_time:.2f}s")
         logger.info(f"Results saved to: {args.output}")
 
@@ -0,0 +1,23 @@
+"""Test-only memoizing wrappers around expensive criteria helpers."""
+import hashlib
+
+from PIL import Image
+
+from document_assessor.criteria import estimate_dpi_from_image
+
+# estimate_dpi_from_image results keyed by image_signature
+_DPI_CACHE: dict = {}
+
+
+def image_signature(img: Image.Image) -> tuple:
+    """A cheap key identifying an image by size, mode and a short pixel digest."""
+    digest = hashlib.blake2b(img.tobytes(), digest_size=8).digest()
+    return img.size, img.mode, digest
+
+
+def cached_estimate_dpi(img: Image.Image) -> float:
+    """estimate_dpi_from_image, run once per distinct image in a session."""
+    sig = image_signature(img)
+    if sig not in _DPI_CACHE:
+        _DPI_CACHE[sig] = estimate_dpi_from_image(img)
+    return _DPI_CACHE[sig]
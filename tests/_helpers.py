@@ -0,0 +1,54 @@
+"""
+Image helpers shared by the test modules. Kept outside test_*.py so pytest
+neither collects nor assertion-rewrites them.
+"""
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+# A dummy image for mocking
+DUMMY_IMAGE = Image.new("L", (100, 100))
+
+# Named colors are mapped to integer fills so Pillow skips ImageColor parsing
+_FILLS = {"white": 255, "black": 0}
+
+# Seeded PCG64 generator for the synthetic noise
+_RNG = np.random.default_rng(0xC0FFEE)
+
+
+# Helper to create a dummy image
+def create_image(width, height, color):
+    return Image.new("L", (width, height), _FILLS.get(color, color))
+
+
+# Helper to add salt-and-pepper noise
+def add_noise(img, prob=0.1):
+    arr = np.asarray(img, dtype=np.uint8)
+    probs = _RNG.random(arr.shape[:2], dtype=np.float32)
+    output = np.where(
+        probs < (prob / 2),
+        np.uint8(0),
+        np.where(probs > 1 - (prob / 2), np.uint8(255), arr),
+    )
+    return Image.fromarray(output)
+
+
+# Helper for a flat page stamped with DPI metadata. Cached per arguments,
+# so callers share the image and must not modify it.
+@lru_cache(maxsize=None)
+def make_dpi_img(width, height, dpi, color=255):
+    img = Image.new("L", (width, height), _FILLS.get(color, color))
+    img.info = {"dpi": (dpi, dpi)}
+    return img
+
+
+# Helper for a mid-gray page with hard black (top/left) and white
+# (bottom/right) borders, which gives a high Laplacian variance. Cached per
+# size, so callers share the image and must not modify it.
+@lru_cache(maxsize=None)
+def edge_image(width=100, height=100):
+    arr = np.full((height, width), 128, np.uint8)
+    arr[:, [0, -1]] = [0, 255]
+    arr[[0, -1], :] = [[0], [255]]
+    return Image.fromarray(arr, "L")
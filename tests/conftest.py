@@ -1,23 +1,68 @@
 import pytest
-from unittest.mock import patch
-from concurrent.futures import Future
+from PIL import Image
+from unittest.mock import MagicMock, patch
+
+# Shared helper modules, not test files
+collect_ignore = ["_helpers.py", "_fast.py"]
+
+
+class _ImmediateFuture:
+    """
+    A lock-free stand-in for an already completed Future. Tests run
+    single-threaded, so there is no need for Future's internal Condition.
+    """
+    __slots__ = ("_result", "_exception")
+
+    def __init__(self, result=None, exception=None):
+        self._result = result
+        self._exception = exception
+
+    def done(self):
+        return True
+
+    def exception(self, timeout=None):
+        return self._exception
+
+    def result(self, timeout=None):
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+
+def _as_completed(fs, timeout=None):
+    """as_completed for _ImmediateFuture objects, which are all done on submit."""
+    return iter(fs)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')")
+    config.addinivalue_line("markers", "integration: needs real sample documents (deselect with '-m \"not integration\"')")
+
 
 # A mock executor that runs tasks synchronously in the main thread.
 # This mimics the interface of ProcessPoolExecutor but avoids actual multiprocessing.
 class SyncExecutor:
-    def __init__(self, max_workers=None):
-        # max_workers is ignored as we are running synchronously.
-        pass
+    def __init__(self, max_workers=None, mp_context=None, initializer=None, initargs=()):
+        # max_workers and mp_context are ignored as we are running synchronously.
+        # The initializer runs once up front, as it would in each worker process.
+        if initializer is not None:
+            initializer(*initargs)
 
     def submit(self, fn, *args, **kwargs):
-        """Executes the function immediately and returns a completed Future."""
-        future = Future()
+        """Executes the function immediately and returns a completed future."""
         try:
-            result = fn(*args, **kwargs)
-            future.set_result(result)
-        except Exception as e:
-            future.set_exception(e)
-        return future
+            return _ImmediateFuture(result=fn(*args, **kwargs))
+        # Like a pool worker, hand back BaseExceptions too (e.g. a timeout)
+        except BaseException as e:
+            return _ImmediateFuture(exception=e)
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        """Runs the function over the inputs lazily in the calling thread."""
+        return map(fn, *iterables)
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """Nothing to shut down; there are no worker processes."""
+        pass
 
     def __enter__(self):
         """Context manager entry."""
@@ -27,13 +72,62 @@ class SyncExecutor:
         """Context manager exit."""
         pass
 
-@pytest.fixture(autouse=True)
-def disable_multiprocessing_for_tests(monkeypatch):
+@pytest.fixture(scope="session", autouse=True)
+def disable_multiprocessing_for_tests():
     """
     Fixture to automatically replace ProcessPoolExecutor with a synchronous
     executor for all tests. This prevents tests from hanging due to
     multiprocessing issues with pytest-cov and ensures deterministic,
     sequential execution during testing.
+
+    The patch is applied once for the whole session rather than being set
+    and reverted around every test.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("document_assessor.evaluator.ProcessPoolExecutor", SyncExecutor)
+        # concurrent.futures.as_completed expects real Futures
+        mp.setattr("document_assessor.evaluator.as_completed", _as_completed)
+        yield
+
+
+@pytest.fixture
+def mock_get_images(monkeypatch):
     """
-    # Use monkeypatch to replace the class in the specified module
-    monkeypatch.setattr("document_assessor.evaluator.ProcessPoolExecutor", SyncExecutor)
+    Replaces criteria image extraction with one plain MagicMock; tests set its
+    return_value or side_effect instead of opening their own patch() blocks.
+    """
+    mock = MagicMock()
+    monkeypatch.setattr("document_assessor.criteria._get_images_from_path", mock)
+    return mock
+
+
+# Synthetic images shared by the criteria tests. They are built once per
+# session, so tests must not modify them in place; copy() before pasting.
+@pytest.fixture(scope="session")
+def white_200():
+    return Image.new("L", (200, 200), 255)
+
+@pytest.fixture(scope="session")
+def black_200():
+    return Image.new("L", (200, 200), 0)
+
+@pytest.fixture(scope="session")
+def white_300():
+    return Image.new("L", (300, 300), 255)
+
+@pytest.fixture(scope="session")
+def gray_300():
+    """A flat mid-gray image, which has very low entropy."""
+    return Image.new("L", (300, 300), 128)
+
+@pytest.fixture(scope="session")
+def blank_500():
+    return Image.new("L", (500, 500), 255)
+
+@pytest.fixture(scope="session")
+def min_bright_100():
+    return Image.new("L", (100, 100), 50)
+
+@pytest.fixture(scope="session")
+def max_bright_100():
+    return Image.new("L", (100, 100), 220)
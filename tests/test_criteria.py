@@ -1,6 +1,7 @@
-import numpy as np
+from unittest.mock import MagicMock
+
 import pytest
-from PIL import Image
+from PIL import Image, ImageDraw
 
 from document_assessor.models import CriteriaConfig, CriteriaType, Threshold
 from document_assessor.criteria import (
@@ -8,69 +9,57 @@ from document_assessor.criteria import (
     calculate_content_ratio,
     detect_watermark_fft,
     calculate_brightness_with_trim,
-    estimate_dpi_from_image,
-    load_criteria_config
+    image_entropy,
+    load_criteria_config,
+    _entropy_py
 )
-from unittest.mock import patch, mock_open
-
-# Helper to create a dummy image
-def create_image(width, height, color):
-    return Image.new("L", (width, height), color)
-
-# Helper to add salt-and-pepper noise
-def add_noise(img, prob=0.1):
-    output = np.copy(np.array(img))
-    black = 0
-    white = 255
-    probs = np.random.random(output.shape[:2])
-    output[probs < (prob / 2)] = black
-    output[probs > 1 - (prob / 2)] = white
-    return Image.fromarray(output)
 
-class TestCriteriaLogic:
-    """Dedicated tests for specific criteria logic in document_assessor/criteria.py"""
+from _fast import cached_estimate_dpi
+from _helpers import add_noise, make_dpi_img
 
-    def test_text_density_fail_too_low(self):
-        """Test text_density fails when content ratio is below min_percent."""
-        criteria = [
-            CriteriaConfig(
-                name="text_density",
-                type=CriteriaType.required,
-                description="dummy",
-                threshold=Threshold(min_percent=5.0, max_percent=80.0),
-                aggregate_mode="avg"
-            )
-        ]
-        # Image is 98% white, content ratio is ~2%
-        img = create_image(200, 200, "white")
-        img.paste(create_image(20, 40, "black"), (90, 80))
+# Criteria shared by the parametrized tests, validated once at import
+TEXT_DENSITY_CRITERIA = CriteriaConfig(
+    name="text_density",
+    type=CriteriaType.required,
+    description="dummy",
+    threshold=Threshold(min_percent=5.0, max_percent=80.0),
+    aggregate_mode="avg"
+)
+NOISE_CRITERIA = CriteriaConfig(
+    name="noise",
+    type=CriteriaType.required,
+    description="dummy",
+    threshold=Threshold(max_percent=5.0)
+)
+BRIGHTNESS_CRITERIA = CriteriaConfig(
+    name="brightness",
+    type=CriteriaType.required,
+    description="dummy",
+    threshold=Threshold(min=50, max=220),
+)
 
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[img]):
-            is_accepted, reasons, _ = run_all_checks_for_document("fake.pdf", "pdf", criteria)
-            assert not is_accepted
-            assert "Text density out of range" in reasons[0]
+@pytest.fixture(scope="module")
+def noisy_300(white_300):
+    """The white 300x300 image with 30% salt-and-pepper noise."""
+    return add_noise(white_300, prob=0.3)
 
-    def test_text_density_fail_too_high(self):
-        """Test text_density fails when content ratio is above max_percent."""
-        criteria = [
-            CriteriaConfig(
-                name="text_density",
-                type=CriteriaType.required,
-                description="dummy",
-                threshold=Threshold(min_percent=5.0, max_percent=80.0),
-                aggregate_mode="avg"
-            )
-        ]
-        # Image is 90% black, content ratio is ~90%
-        img = create_image(200, 200, "black")
-        img.paste(create_image(20, 40, "white"), (90, 80))
+class TestCriteriaLogic:
+    """Dedicated tests for specific criteria logic in document_assessor/criteria.py"""
 
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[img]):
-            is_accepted, reasons, _ = run_all_checks_for_document("fake.pdf", "pdf", criteria)
-            assert not is_accepted
-            assert "Text density out of range" in reasons[0]
+    # Rectangle corners are inclusive, so [90, 80, 109, 119] covers a 20x40 block.
+    # On white the block is ~2% content (too low), on black ~98% (too high).
+    @pytest.mark.parametrize("base, fill", [("white_200", 0), ("black_200", 255)], ids=["too_low", "too_high"])
+    def test_text_density_fail(self, request, mock_get_images, base, fill):
+        """Test text_density fails when content ratio is outside min_percent..max_percent."""
+        img = request.getfixturevalue(base).copy()
+        ImageDraw.Draw(img).rectangle([90, 80, 109, 119], fill=fill)
 
-    def test_missing_pages_fail(self):
+        mock_get_images.return_value = [img]
+        is_accepted, reasons, _ = run_all_checks_for_document("fake.pdf", "pdf", [TEXT_DENSITY_CRITERIA])
+        assert not is_accepted
+        assert "Text density out of range" in reasons[0]
+
+    def test_missing_pages_fail(self, mock_get_images, white_200):
         """Test missing_pages fails if a page is nearly blank."""
         criteria = [
             CriteriaConfig(
@@ -82,50 +71,30 @@ class TestCriteriaLogic:
             )
         ]
         # Page has a content ratio of ~0.5%, which is below the 1.0% threshold
-        img = create_image(200, 200, "white")
-        img.paste(create_image(10, 20, "black"), (90, 90))
-
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[img]):
-            is_accepted, reasons, _ = run_all_checks_for_document("fake.pdf", "pdf", criteria)
-            assert is_accepted  # Recommended, so it shouldn't fail the document
-            assert "Page may be missing or blank" in reasons[0]
-
-    def test_noise_fail(self):
-        """Test noise check fails when there is too much noise."""
-        criteria = [
-            CriteriaConfig(
-                name="noise",
-                type=CriteriaType.required,
-                description="dummy",
-                threshold=Threshold(max_percent=5.0)
-            )
-        ]
-        clean_img = create_image(300, 300, "white")
-        noisy_img = add_noise(clean_img, prob=0.3) # 30% noise
-
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[noisy_img]):
-            is_accepted, reasons, _ = run_all_checks_for_document("fake.jpg", "jpg", criteria)
-            assert not is_accepted
-            assert "Noise level too high" in reasons[0]
-
-    def test_noise_pass(self):
-        """Test noise check passes for a clean image."""
-        criteria = [
-            CriteriaConfig(
-                name="noise",
-                type=CriteriaType.required,
-                description="dummy",
-                threshold=Threshold(max_percent=5.0)
-            )
-        ]
-        clean_img = create_image(300, 300, "white")
-
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[clean_img]):
-            is_accepted, reasons, _ = run_all_checks_for_document("fake.jpg", "jpg", criteria)
-            assert is_accepted
+        img = white_200.copy()
+        ImageDraw.Draw(img).rectangle([90, 90, 99, 109], fill=0)
+
+        mock_get_images.return_value = [img]
+        is_accepted, reasons, _ = run_all_checks_for_document("fake.pdf", "pdf", criteria)
+        assert is_accepted  # Recommended, so it shouldn't fail the document
+        assert "Page may be missing or blank" in reasons[0]
+
+    @pytest.mark.parametrize(
+        "image, expected_accepted",
+        [pytest.param("noisy_300", False, marks=pytest.mark.slow), ("white_300", True)],
+        ids=["noisy_fails", "clean_passes"],
+    )
+    def test_noise(self, request, mock_get_images, image, expected_accepted):
+        """Test noise check fails with 30% salt-and-pepper noise and passes for a clean image."""
+        mock_get_images.return_value = [request.getfixturevalue(image)]
+        is_accepted, reasons, _ = run_all_checks_for_document("fake.jpg", "jpg", [NOISE_CRITERIA])
+        assert is_accepted is expected_accepted
+        if expected_accepted:
             assert reasons == []
+        else:
+            assert "Noise level too high" in reasons[0]
 
-    def test_compression_fail(self):
+    def test_compression_fail(self, mock_get_images, gray_300):
         """Test compression check fails for an image with low entropy."""
         criteria = [
             CriteriaConfig(
@@ -136,14 +105,19 @@ class TestCriteriaLogic:
             )
         ]
         # A plain image has very low entropy
-        low_entropy_img = create_image(300, 300, 128)
-
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[low_entropy_img]):
-            is_accepted, _, warnings = run_all_checks_for_document("fake.jpg", "jpg", criteria)
-            assert is_accepted # It's a warning
-            assert "Compression artifact detected" in warnings[0]
-
-    def test_resolution_pass_on_smart_estimation(self):
+        mock_get_images.return_value = [gray_300]
+        is_accepted, _, warnings = run_all_checks_for_document("fake.jpg", "jpg", criteria)
+        assert is_accepted # It's a warning
+        assert "Compression artifact detected" in warnings[0]
+        # The native Pillow entropy is used where available
+        assert image_entropy is Image.Image.entropy
+
+    def test_entropy_fallback_matches_native(self, noisy_300, gray_300):
+        """Test the pure-Python entropy agrees with Pillow's Image.entropy."""
+        for img in (noisy_300, gray_300):
+            assert _entropy_py(img) == pytest.approx(img.entropy())
+
+    def test_resolution_pass_on_smart_estimation(self, mock_get_images, monkeypatch):
         """Test that resolution passes if smart estimation is above threshold."""
         criteria = [
             CriteriaConfig(
@@ -153,43 +127,30 @@ class TestCriteriaLogic:
                 threshold=Threshold(min_dpi=200),
             )
         ]
-        # Image has low metadata DPI but estimation will return a high DPI
-        low_res_image = create_image(800, 600, "white")
-        low_res_image.info = {"dpi": (72, 72)}
-
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[low_res_image]):
-            with patch("document_assessor.criteria.estimate_dpi_from_image", return_value=250):
-                is_accepted, reasons, _ = run_all_checks_for_document("fake.pdf", "pdf", criteria)
-                assert is_accepted
-                assert reasons == []
-
-    def test_brightness_pass_at_edges(self):
+        # Image has low metadata DPI but estimation will return a high DPI.
+        # A dark page, since blank pages skip the resolution check entirely.
+        low_res_image = make_dpi_img(80, 60, 72, "black")
+
+        mock_get_images.return_value = [low_res_image]
+        mock_estimate = MagicMock(return_value=250)
+        monkeypatch.setattr("document_assessor.criteria.estimate_dpi_from_image", mock_estimate)
+        is_accepted, reasons, _ = run_all_checks_for_document("fake.pdf", "pdf", criteria)
+        assert is_accepted
+        assert reasons == []
+        mock_estimate.assert_called_once()
+
+    @pytest.mark.parametrize("image", ["min_bright_100", "max_bright_100"])
+    def test_brightness_pass_at_edges(self, request, mock_get_images, image):
         """Test brightness check passes at the exact min/max thresholds."""
-        criteria = [
-            CriteriaConfig(
-                name="brightness",
-                type=CriteriaType.required,
-                description="dummy",
-                threshold=Threshold(min=50, max=220),
-            )
-        ]
-        # Test with an image at the minimum brightness
-        min_bright_img = create_image(100, 100, 50)
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[min_bright_img]):
-            is_accepted, _, _ = run_all_checks_for_document("fake.jpg", "jpg", criteria)
-            assert is_accepted
-
-        # Test with an image at the maximum brightness
-        max_bright_img = create_image(100, 100, 220)
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[max_bright_img]):
-            is_accepted, _, _ = run_all_checks_for_document("fake.jpg", "jpg", criteria)
-            assert is_accepted
-
-    def test_estimate_dpi_no_contours(self):
+        mock_get_images.return_value = [request.getfixturevalue(image)]
+        is_accepted, _, _ = run_all_checks_for_document("fake.jpg", "jpg", [BRIGHTNESS_CRITERIA])
+        assert is_accepted
+
+    @pytest.mark.slow
+    def test_estimate_dpi_no_contours(self, blank_500):
         """Test DPI estimation returns 0.0 if no character-like contours are found."""
         # A completely blank image will have no contours
-        blank_image = create_image(500, 500, "white")
-        dpi = estimate_dpi_from_image(blank_image)
+        dpi = cached_estimate_dpi(blank_500)
         assert dpi == 0.0
 
     def test_unsupported_file_format(self):
@@ -200,11 +161,10 @@ class TestCriteriaLogic:
         assert not is_accepted
         assert "Failed to extract images" in reasons[0]
 
-    def test_brightness_on_blank_image(self):
+    def test_brightness_on_blank_image(self, white_200):
         """Test that brightness calculation handles a completely blank image."""
-        blank_image = create_image(200, 200, "white")
         # Expecting it not to crash and return the brightness of white (255)
-        brightness = calculate_brightness_with_trim(blank_image)
+        brightness = calculate_brightness_with_trim(white_200)
         assert brightness == 255
 
     def test_load_criteria_config_file_not_found(self):
@@ -212,9 +172,9 @@ class TestCriteriaLogic:
         with pytest.raises(Exception):
             load_criteria_config("/non/existent/config.json")
 
-    def test_load_criteria_config_invalid_json(self):
+    def test_load_criteria_config_invalid_json(self, tmp_path):
         """Test config loading raises an error for invalid JSON."""
-        m = mock_open(read_data='{"criteria": [invalid_json]}')
-        with patch("builtins.open", m):
-            with pytest.raises(Exception):
-                load_criteria_config("fake_path")
\ No newline at end of file
+        config_file = tmp_path / "criteria_config.json"
+        config_file.write_text('{"criteria": [invalid_json]}')
+        with pytest.raises(Exception):
+            load_criteria_config(str(config_file))
\ No newline at end of file
@@ -1,28 +1,60 @@
 import json
 import os
+import signal
+import time
 from unittest.mock import patch
 
+import numpy as np
+import pymupdf
 import pytest
 from PIL import Image
 
 # Corrected imports
 from document_assessor.models import CriteriaConfig, CriteriaType, Threshold, Document, DocumentBatch
 from document_assessor.criteria import run_all_checks_for_document
-from document_assessor.evaluator import evaluate_document_worker, run_pipeline
+from document_assessor.evaluator import EvaluationTimeout, evaluate_document_worker, run_pipeline
+from document_assessor.handlers import pdf_handler
+from _helpers import DUMMY_IMAGE, edge_image, make_dpi_img
 
-# A dummy image for mocking
-DUMMY_IMAGE = Image.new("L", (100, 100))
+# Documents with and without OCR, validated once; the worker only reads them
+OCR_DOC = Document(documentID="d1", documentPath="/fake", documentFormat="pdf", requiresOCR=True)
+NO_OCR_DOC = OCR_DOC.model_copy(update={"requiresOCR": False})
+
+
+def _crit(name, type=CriteriaType.required, description="dummy", **threshold):
+    """
+    Builds test criteria with model_construct, skipping pydantic validation
+    for inputs that are known to be well formed.
+    """
+    return CriteriaConfig.model_construct(
+        name=name,
+        type=type,
+        description=description,
+        threshold=Threshold.model_construct(**threshold) if threshold else None,
+    )
+
+
+# Criteria shared across tests; built once at import and never mutated
+FILE_INTEGRITY_REQ = _crit("file_integrity")
+RESOLUTION_REQ = _crit("resolution", min_dpi=200)
+BLUR_REQ = _crit("blur", min_variance=100)
+BRIGHTNESS_REQ = _crit("brightness", min=50, max=230)
+SKEW_REC = _crit("skew", CriteriaType.recommended, max_deg=2)
+DUMMY_REQ = _crit("dummy", description="d")
+
+# The worker can only interrupt an overrunning evaluation where SIGALRM exists
+needs_alarm = pytest.mark.skipif(
+    not hasattr(signal, "setitimer"), reason="needs signal.setitimer (SIGALRM)"
+)
 
 # Test for the main evaluation logic in criteria.py
 class TestRunAllChecks:
     """Tests for the run_all_checks_for_document function."""
 
-    @patch("document_assessor.criteria._get_images_from_path", return_value=[DUMMY_IMAGE])
     def test_file_integrity_pass(self, mock_get_images):
         """Test that file_integrity passes if images can be extracted."""
-        criteria = [
-            CriteriaConfig(name="file_integrity", type=CriteriaType.required, description="dummy")
-        ]
+        mock_get_images.return_value = [DUMMY_IMAGE]
+        criteria = [FILE_INTEGRITY_REQ]
         is_accepted, reasons, warnings = run_all_checks_for_document(
             "/fake/path.pdf", "pdf", criteria
         )
@@ -31,21 +63,19 @@ class TestRunAllChecks:
         assert warnings == []
         mock_get_images.assert_called_once()
 
-    @patch("document_assessor.criteria._get_images_from_path", return_value=[])
     def test_file_integrity_fail_no_images(self, mock_get_images):
         """Test that the check fails if no images are extracted."""
-        criteria = [
-            CriteriaConfig(name="file_integrity", type=CriteriaType.required, description="dummy")
-        ]
+        mock_get_images.return_value = []
+        criteria = [FILE_INTEGRITY_REQ]
         is_accepted, reasons, warnings = run_all_checks_for_document(
             "/fake/path.pdf", "pdf", criteria
         )
         assert is_accepted is False
         assert "No images could be extracted" in reasons[0]
 
-    @patch("document_assessor.criteria._get_images_from_path", side_effect=ValueError("Test error"))
     def test_critical_error_handling(self, mock_get_images):
         """Test that a critical error during image extraction is handled."""
+        mock_get_images.side_effect = ValueError("Test error")
         is_accepted, reasons, warnings = run_all_checks_for_document(
             "/fake/path.pdf", "pdf", []
         )
@@ -53,68 +83,88 @@ class TestRunAllChecks:
         assert "Critical error during evaluation" in reasons[0]
         assert "Test error" in reasons[0]
 
-    def test_resolution_fail(self):
+    def test_resolution_fail(self, mock_get_images, monkeypatch):
         """Test resolution check failing due to low DPI."""
-        criteria = [
-            CriteriaConfig(
-                name="resolution",
-                type=CriteriaType.required,
-                description="dummy",
-                threshold=Threshold(min_dpi=200),
-            )
-        ]
+        criteria = [RESOLUTION_REQ]
         # Mock image with low DPI in metadata
-        low_res_image = Image.new("L", (800, 600))
-        low_res_image.info = {"dpi": (150, 150)}
+        low_res_image = make_dpi_img(80, 60, 150, "black")
 
         # Patch both metadata check and estimation to fail
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[low_res_image]):
-            with patch("document_assessor.criteria.estimate_dpi_from_image", return_value=160):
-                is_accepted, reasons, warnings = run_all_checks_for_document(
-                    "/fake/path.pdf", "pdf", criteria
-                )
-                assert is_accepted is False
-                assert "Resolution too low" in reasons[0]
-
-    def test_blur_fail(self):
-        """Test blur check failing."""
-        criteria = [
-            CriteriaConfig(
-                name="blur",
-                type=CriteriaType.required,
-                description="dummy",
-                threshold=Threshold(min_variance=100),
-            )
-        ]
-        # A plain white image will have 0 variance, failing the blur check
-        blurry_image = Image.new("L", (500, 500), color=255)
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[blurry_image]):
+        mock_get_images.return_value = [low_res_image]
+        monkeypatch.setattr("document_assessor.criteria.estimate_dpi_from_image", lambda *_: 160)
+        is_accepted, reasons, warnings = run_all_checks_for_document(
+            "/fake/path.pdf", "pdf", criteria
+        )
+        assert is_accepted is False
+        assert "Resolution too low" in reasons[0]
+
+    def test_resolution_from_pdf_page_width(self, mock_get_images, monkeypatch):
+        """Test PDF pages without DPI metadata use the page width the handler recorded."""
+        # 80 px across a 40 pt wide page is 144 DPI
+        page = Image.new("L", (80, 60), 0)
+        page.info = {"page_width_pt": 40}
+        mock_get_images.return_value = [page]
+        monkeypatch.setattr("document_assessor.criteria.estimate_dpi_from_image", lambda *_: 160)
+
+        with patch("pymupdf.open") as mock_open:
             is_accepted, reasons, warnings = run_all_checks_for_document(
-                "/fake/path.jpg", "jpg", criteria
+                "/fake/path.pdf", "pdf", [RESOLUTION_REQ]
             )
-            assert is_accepted is False
-            assert "Image too blurry" in reasons[0]
+            mock_open.assert_not_called()
+
+        assert is_accepted is False
+        assert "metadata_dpi: 144.00" in reasons[0]
 
-    def test_skew_fail(self):
+    def test_blur_fail(self, mock_get_images, blank_500):
+        """Test blur check failing."""
+        criteria = [BLUR_REQ]
+        # A plain white image will have 0 variance, failing the blur check
+        mock_get_images.return_value = [blank_500]
+        is_accepted, reasons, warnings = run_all_checks_for_document(
+            "/fake/path.jpg", "jpg", criteria
+        )
+        assert is_accepted is False
+        assert "Image too blurry" in reasons[0]
+
+    def test_brightness_pass(self, mock_get_images):
+        """Test brightness check passes for a page with mixed dark and bright areas."""
+        criteria = [BRIGHTNESS_REQ]
+        # Mid-gray page with a dark and a bright quadrant, built directly as L-mode pixels
+        arr = np.full((100, 100), 128, np.uint8)
+        arr[:50, :50] = 30
+        arr[50:, 50:] = 220
+        page = Image.fromarray(arr, "L")
+        mock_get_images.return_value = [page]
+        is_accepted, reasons, warnings = run_all_checks_for_document(
+            "/fake/path.jpg", "jpg", criteria
+        )
+        assert is_accepted is True
+        assert reasons == []
+
+    def test_blur_pass(self, mock_get_images):
+        """Test blur check passes for a page with sharp edges."""
+        criteria = [BLUR_REQ]
+        # Hard black/white borders give a high Laplacian variance
+        mock_get_images.return_value = [edge_image()]
+        is_accepted, reasons, warnings = run_all_checks_for_document(
+            "/fake/path.jpg", "jpg", criteria
+        )
+        assert is_accepted is True
+        assert reasons == []
+
+    def test_skew_fail(self, mock_get_images):
         """Test skew check failing."""
-        criteria = [
-            CriteriaConfig(
-                name="skew",
-                type=CriteriaType.recommended,
-                description="dummy",
-                threshold=Threshold(max_deg=2),
+        criteria = [SKEW_REC]
+        mock_get_images.return_value = [DUMMY_IMAGE]
+        # Patch the calculation to return a high skew angle
+        with patch("document_assessor.criteria.calculate_skew", return_value=4.0):
+            is_accepted, reasons, warnings = run_all_checks_for_document(
+                "/fake/path.tiff", "tiff", criteria
             )
-        ]
-        with patch("document_assessor.criteria._get_images_from_path", return_value=[DUMMY_IMAGE]):
-            # Patch the calculation to return a high skew angle
-            with patch("document_assessor.criteria.calculate_skew", return_value=4.0):
-                is_accepted, reasons, warnings = run_all_checks_for_document(
-                    "/fake/path.tiff", "tiff", criteria
-                )
-                # It's a recommended check, so isAccepted should be True
-                assert is_accepted is True
-                assert "Skew angle too large" in reasons[0]
-                assert warnings == []
+            # It's a recommended check, so isAccepted should be True
+            assert is_accepted is True
+            assert "Skew angle too large" in reasons[0]
+            assert warnings == []
 
 
 # Test for the evaluator which calls the main logic
@@ -123,59 +173,104 @@ class TestEvaluator:
 
     def test_evaluate_document_worker_no_ocr(self):
         """Test that documents not requiring OCR are accepted."""
-        doc = Document(documentID="d1", documentPath="/fake", documentFormat="pdf", requiresOCR=False)
-        is_accepted, reasons, warnings = evaluate_document_worker(doc, [], 60)
+        is_accepted, reasons, warnings = evaluate_document_worker(NO_OCR_DOC, [], 60)
         assert is_accepted is True
         assert reasons == []
         assert warnings == []
 
+    @pytest.mark.parametrize(
+        "check_result, exp_accepted, exp_reasons, exp_warnings",
+        [
+            # A required criterion fails
+            ((False, ["Resolution too low"], []), False, ["Resolution too low"], []),
+            # A recommended criterion fails: accepted, but the reason is reported
+            ((True, ["Skew angle too large"], []), True, ["Skew angle too large"], []),
+            # A warning criterion fails: accepted with a warning
+            ((True, [], ["Watermark detected"]), True, [], ["Watermark detected"]),
+        ],
+        ids=["required_fail", "recommended_fail", "warning_fail"],
+    )
     @patch("document_assessor.evaluator.run_all_checks_for_document")
-    def test_evaluate_document_worker_required_fail(self, mock_run_all_checks):
-        """Test worker when a required criterion fails."""
-        mock_run_all_checks.return_value = (False, ["Resolution too low"], [])
-        doc = Document(documentID="d1", documentPath="/fake", documentFormat="pdf", requiresOCR=True)
-        
-        is_accepted, reasons, warnings = evaluate_document_worker(doc, [], 60)
-        
-        assert is_accepted is False
-        assert reasons == ["Resolution too low"]
-        assert warnings == []
+    def test_evaluate_document_worker_check_results(
+        self, mock_run_all_checks, check_result, exp_accepted, exp_reasons, exp_warnings
+    ):
+        """Test the worker passes the outcome of the criteria checks through."""
+        mock_run_all_checks.return_value = check_result
+
+        is_accepted, reasons, warnings = evaluate_document_worker(OCR_DOC, [], 60)
+
+        assert is_accepted is exp_accepted
+        assert reasons == exp_reasons
+        assert warnings == exp_warnings
         mock_run_all_checks.assert_called_once()
 
+    @needs_alarm
     @patch("document_assessor.evaluator.run_all_checks_for_document")
-    def test_evaluate_document_worker_recommended_fail(self, mock_run_all_checks):
-        """Test worker when a recommended criterion fails."""
-        # The check itself returns True for is_accepted, but includes a reason
-        mock_run_all_checks.return_value = (True, ["Skew angle too large"], [])
-        doc = Document(documentID="d1", documentPath="/fake", documentFormat="pdf", requiresOCR=True)
-        
-        is_accepted, reasons, warnings = evaluate_document_worker(doc, [], 60)
-        
-        assert is_accepted is True
-        assert reasons == ["Skew angle too large"]
-        assert warnings == []
+    def test_evaluate_document_worker_timeout(self, mock_run_all_checks):
+        """Test worker aborts an evaluation that overruns its timeout."""
+        mock_run_all_checks.side_effect = lambda *args: time.sleep(5)
+
+        is_accepted, reasons, warnings = evaluate_document_worker(OCR_DOC, [], 0.1)
+
+        assert is_accepted is False
+        assert "exceeded timeout" in reasons[0]
 
+    @needs_alarm
     @patch("document_assessor.evaluator.run_all_checks_for_document")
-    def test_evaluate_document_worker_warning_fail(self, mock_run_all_checks):
-        """Test worker when a warning criterion fails."""
-        # The check returns True, with no reasons, but with a warning
-        mock_run_all_checks.return_value = (True, [], ["Watermark detected"])
-        doc = Document(documentID="d1", documentPath="/fake", documentFormat="pdf", requiresOCR=True)
-        
-        is_accepted, reasons, warnings = evaluate_document_worker(doc, [], 60)
-        
-        assert is_accepted is True
-        assert reasons == []
-        assert warnings == ["Watermark detected"]
+    def test_evaluate_document_worker_restores_caller_timer(self, mock_run_all_checks):
+        """Test the worker re-arms an ITIMER_REAL timer the caller had set."""
+        mock_run_all_checks.return_value = (True, [], [])
+        previous_handler = signal.signal(signal.SIGALRM, lambda *args: None)
+        signal.setitimer(signal.ITIMER_REAL, 30)
+        try:
+            evaluate_document_worker(OCR_DOC, [], 60)
+            delay, _ = signal.getitimer(signal.ITIMER_REAL)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+        assert 25 < delay <= 30
+
+    @needs_alarm
+    def test_evaluate_document_worker_timeout_inside_page_loop(self, tmp_path, monkeypatch):
+        """Test a timeout while a later page renders rejects the document.
+
+        The PDF handler skips pages that raise Exception; the timeout must
+        not be swallowed there and leave the document judged on fewer pages.
+        """
+        pdf_path = tmp_path / "three_pages.pdf"
+        with pymupdf.open() as pdf:
+            for _ in range(3):
+                pdf.new_page(width=100, height=100)
+            pdf.save(pdf_path)
+
+        render_page = pdf_handler._render_page
+
+        def slow_second_page(doc, page_num, *args):
+            if page_num == 1:
+                time.sleep(1.5)
+            return render_page(doc, page_num, *args)
+
+        monkeypatch.setattr(pdf_handler, "_render_page", slow_second_page)
+        doc = OCR_DOC.model_copy(update={"documentPath": str(pdf_path)})
+
+        is_accepted, reasons, warnings = evaluate_document_worker(
+            doc, [FILE_INTEGRITY_REQ], 0.5
+        )
+
+        assert is_accepted is False
+        assert "exceeded timeout" in reasons[0]
 
 # Simplified pipeline test
 class TestPipeline:
     """Tests for the main run_pipeline function."""
 
+    @pytest.mark.slow
+    @pytest.mark.parametrize("n_docs", [1, 4, 16])
     @patch("document_assessor.evaluator.run_all_checks_for_document")
-    def test_run_pipeline_success(self, mock_run_all_checks):
+    def test_run_pipeline_success(self, mock_run_all_checks, n_docs):
         """
-        Test a successful pipeline run.
+        Test a successful pipeline run over batches of distinct documents.
         The ProcessPoolExecutor is automatically replaced by a synchronous
         executor via the fixture in conftest.py, so we don't need to mock it here.
         """
@@ -188,24 +283,78 @@ class TestPipeline:
                 "transactionID": "t1",
                 "documents": [
                     {
-                        "documentID": "doc1",
-                        "documentPath": "/fake/doc1.pdf",
+                        "documentID": f"doc{i}",
+                        "documentPath": f"/fake/doc{i}.pdf",
                         "documentFormat": "pdf",
                         "requiresOCR": True,
                     }
+                    for i in range(n_docs)
                 ],
             }
         ]
-        
-        # Dummy criteria list
-        criteria_list = [CriteriaConfig(name="dummy", type=CriteriaType.required, description="d")]
 
         # The pipeline will now run sequentially due to the conftest fixture
+        result = run_pipeline(input_data, criteria_list=[DUMMY_REQ])
+
+        assert len(result[0]["documents"]) == n_docs
+        assert all(doc["isAccepted"] is True for doc in result[0]["documents"])
+        # Every distinct path is evaluated exactly once
+        assert mock_run_all_checks.call_count == n_docs
+
+    @patch("document_assessor.evaluator.run_all_checks_for_document")
+    def test_run_pipeline_deduplicates_same_path(self, mock_run_all_checks):
+        """Test documents sharing a path are evaluated once and share the result."""
+        mock_run_all_checks.return_value = (False, ["Image too blurry"], [])
+
+        input_data = [
+            {
+                "customerID": "c1",
+                "documents": [
+                    {
+                        "documentID": doc_id,
+                        "documentPath": "/fake/same.pdf",
+                        "documentFormat": "pdf",
+                        "requiresOCR": True,
+                    }
+                    for doc_id in ("doc1", "doc1_retry")
+                ],
+            }
+        ]
+        criteria_list = [DUMMY_REQ]
+
         result = run_pipeline(input_data, criteria_list=criteria_list)
 
-        assert result[0]["documents"][0]["isAccepted"] is True
-        # Check that our underlying check function was called
-        mock_run_all_checks.assert_called()
+        mock_run_all_checks.assert_called_once()
+        for doc in result[0]["documents"]:
+            assert doc["isAccepted"] is False
+            assert doc["reasons"] == ["Image too blurry"]
+
+    @patch("document_assessor.evaluator.evaluate_document_worker")
+    def test_run_pipeline_rejects_escaped_timeout(self, mock_worker):
+        """Test a timeout escaping a worker rejects that document, not the batch."""
+        mock_worker.side_effect = [EvaluationTimeout("late alarm"), (True, [], [])]
+
+        input_data = [
+            {
+                "customerID": "c1",
+                "documents": [
+                    {
+                        "documentID": f"doc{i}",
+                        "documentPath": f"/fake/doc{i}.pdf",
+                        "documentFormat": "pdf",
+                        "requiresOCR": True,
+                    }
+                    for i in range(2)
+                ],
+            }
+        ]
+
+        result = run_pipeline(input_data, criteria_list=[DUMMY_REQ])
+
+        docs = {doc["documentID"]: doc for doc in result[0]["documents"]}
+        assert docs["doc0"]["isAccepted"] is False
+        assert "late alarm" in docs["doc0"]["reasons"][0]
+        assert docs["doc1"]["isAccepted"] is True
 
     def test_run_pipeline_invalid_data_model(self):
         """Test pipeline with data that fails Pydantic validation."""
@@ -1,6 +1,7 @@
-import base64
+from functools import lru_cache
 from unittest.mock import MagicMock, patch
 
+import pymupdf
 import pytest
 from PIL import Image
 
@@ -8,25 +9,41 @@ from document_assessor.handlers.pdf_handler import get_images_from_pdf
 from document_assessor.handlers.tiff_handler import get_images_from_tiff
 
 
-# Helper to create valid dummy image bytes
-def _get_dummy_png_bytes() -> bytes:
-    """Returns bytes for a valid 1x1 black PNG."""
-    png_b64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
-    return base64.b64decode(png_b64)
+@lru_cache(maxsize=None)
+def _blank_samples(size: int) -> memoryview:
+    """A read-only zero buffer of the given size, built once per size."""
+    return memoryview(bytes(size))
+
+
+# Helper to fill a mock pixmap with a blank grayscale raster
+def _set_gray_samples(mock_pixmap, width: int, height: int) -> None:
+    """Configures the mock pixmap as a width x height single-channel raster."""
+    mock_pixmap.width = width
+    mock_pixmap.height = height
+    mock_pixmap.stride = width
+    mock_pixmap.xres = mock_pixmap.yres = 72
+    mock_pixmap.samples_mv = _blank_samples(width * height)
+
+
+@pytest.fixture(scope="session")
+def tiny_gray_image():
+    """A 100x100 grayscale frame shared by the TIFF tests; never modified."""
+    return Image.new("L", (100, 100))
 
 
 @pytest.fixture
 def mock_pdf_doc():
     """A pytest fixture to create a mock PyMuPDF document object."""
-    # Create a mock for the document object that the `with` statement will use
-    mock_doc = MagicMock()
+    # spec_set limits each mock to the real PyMuPDF interface, so a typo or
+    # API drift fails loudly instead of silently creating a child mock.
+    mock_doc = MagicMock(spec_set=pymupdf.Document)
     mock_doc.__enter__.return_value = mock_doc  # Important for `with` statement
     mock_doc.__exit__.return_value = None
 
     # Mock page methods
-    mock_page = MagicMock()
-    mock_pixmap = MagicMock()
-    mock_pixmap.tobytes.return_value = _get_dummy_png_bytes()
+    mock_page = MagicMock(spec_set=pymupdf.Page)
+    mock_pixmap = MagicMock(spec_set=pymupdf.Pixmap)
+    _set_gray_samples(mock_pixmap, 1, 1)
     mock_page.get_pixmap.return_value = mock_pixmap
     mock_page.rect.width = 800
     mock_page.rect.height = 600
@@ -35,132 +52,132 @@ def mock_pdf_doc():
     return mock_doc
 
 
+@patch("pymupdf.open")
 class TestPDFHandler:
-    """Test PDF handler functionality"""
-
-    def test_get_images_from_pdf_success(self, mock_pdf_doc):
-        """Test successful PDF to image conversion"""
-        mock_pdf_doc.__len__.return_value = 2
-
-        mock_image = Image.new("L", (100, 100))
-
-        with patch("pymupdf.open", return_value=mock_pdf_doc), patch(
-            "PIL.Image.open", return_value=mock_image
-        ), patch("io.BytesIO"):
-            result = get_images_from_pdf("/fake/path.pdf", max_pages=2)
-
-            assert len(result) == 2
+    """Test PDF handler functionality
+
+    pymupdf.open is patched once for the class; each test configures the
+    mock's return_value or side_effect instead of opening its own patch().
+    """
+
+    def test_get_images_from_pdf_page_counts(self, mock_open, mock_pdf_doc):
+        """Test pages rendered for full, capped and empty documents"""
+        mock_open.return_value = mock_pdf_doc
+        # (pages in the PDF, max_pages, expected images)
+        cases = [
+            (2, 2, 2),  # every page converted
+            (10, 3, 3),  # max_pages caps a longer document
+            (0, 5, 0),  # empty document
+        ]
+        for n_pages, max_pages, expected in cases:
+            mock_pdf_doc.__len__.return_value = n_pages
+
+            result = get_images_from_pdf("/fake/path.pdf", max_pages=max_pages)
+
+            assert len(result) == expected, (n_pages, max_pages)
             assert all(isinstance(img, Image.Image) for img in result)
+            assert mock_pdf_doc.load_page.call_count == expected
             # __exit__ is called automatically by with statement, which can imply close.
             mock_pdf_doc.__exit__.assert_called_once()
-
-    def test_get_images_from_pdf_with_max_pages_limit(self, mock_pdf_doc):
-        """Test PDF processing respects max_pages limit"""
-        mock_pdf_doc.__len__.return_value = 10  # PDF has 10 pages
-
-        with patch("pymupdf.open", return_value=mock_pdf_doc), patch(
-            "PIL.Image.open", return_value=Image.new("L", (1, 1))
-        ):
-            get_images_from_pdf("/fake/path.pdf", max_pages=3)
-            assert mock_pdf_doc.load_page.call_count == 3
-            mock_pdf_doc.__exit__.assert_called_once()
-
-    def test_get_images_from_pdf_file_not_found(self):
-        """Test PDF handler with non-existent file"""
-        with patch("pymupdf.open", side_effect=FileNotFoundError("File not found")):
-            with pytest.raises(ValueError, match="File not found"):
-                get_images_from_pdf("/nonexistent/path.pdf")
-
-    def test_get_images_from_pdf_corrupted_file(self):
-        """Test PDF handler with corrupted PDF file"""
-        with patch("pymupdf.open", side_effect=Exception("Corrupted PDF")):
-            with pytest.raises(ValueError, match="Corrupted PDF"):
-                get_images_from_pdf("/corrupted/file.pdf")
-
-    def test_get_images_from_pdf_empty_document(self, mock_pdf_doc):
-        """Test PDF handler with empty document"""
-        mock_pdf_doc.__len__.return_value = 0
-
-        with patch("pymupdf.open", return_value=mock_pdf_doc):
-            result = get_images_from_pdf("/empty/file.pdf")
-            assert len(result) == 0
-            mock_pdf_doc.__exit__.assert_called_once()
-
-    def test_get_images_from_pdf_page_processing_error(self, mock_pdf_doc):
-        """Test PDF handler when page processing fails"""
+            mock_pdf_doc.reset_mock()
+
+    @pytest.mark.parametrize(
+        "exc, match",
+        [
+            (FileNotFoundError("File not found"), "File not found"),
+            (Exception("Corrupted PDF"), "Corrupted PDF"),
+        ],
+        ids=["file_not_found", "corrupted_file"],
+    )
+    def test_get_images_from_pdf_open_error(self, mock_open, exc, match):
+        """Test PDF handler wraps errors opening the file in ValueError"""
+        mock_open.side_effect = exc
+        with pytest.raises(ValueError, match=match):
+            get_images_from_pdf("/problematic/file.pdf")
+
+    @pytest.mark.parametrize(
+        "failing_call",
+        ["load_page", "get_pixmap"],
+        ids=["page_processing_error", "pixmap_error"],
+    )
+    def test_get_images_from_pdf_first_page_error(self, mock_open, mock_pdf_doc, failing_call):
+        """Test PDF handler when loading or rendering the only page fails"""
         mock_pdf_doc.__len__.return_value = 1
-        mock_pdf_doc.load_page.side_effect = Exception("Page processing failed")
-
-        with patch("pymupdf.open", return_value=mock_pdf_doc):
-            with pytest.raises(
-                ValueError, match="Failed to extract even the first page"
-            ):
-                get_images_from_pdf("/problematic/file.pdf")
-            mock_pdf_doc.__exit__.assert_called_once()
-
-    def test_get_images_from_pdf_pixmap_error(self, mock_pdf_doc):
-        """Test PDF handler when pixmap creation fails"""
-        mock_pdf_doc.__len__.return_value = 1
-        mock_pdf_doc.load_page.return_value.get_pixmap.side_effect = Exception(
-            "Pixmap creation failed"
-        )
-
-        with patch("pymupdf.open", return_value=mock_pdf_doc):
-            with pytest.raises(
-                ValueError, match="Failed to extract even the first page"
-            ):
-                get_images_from_pdf("/problematic/file.pdf")
-            mock_pdf_doc.__exit__.assert_called_once()
+        if failing_call == "load_page":
+            mock_pdf_doc.load_page.side_effect = Exception("Page processing failed")
+        else:
+            mock_pdf_doc.load_page.return_value.get_pixmap.side_effect = Exception(
+                "Pixmap creation failed"
+            )
+        mock_open.return_value = mock_pdf_doc
+
+        with pytest.raises(
+            ValueError, match="Failed to extract even the first page"
+        ):
+            get_images_from_pdf("/problematic/file.pdf")
+        mock_pdf_doc.__exit__.assert_called_once()
 
-    def test_get_images_from_pdf_dpi_parameter(self, mock_pdf_doc):
+    def test_get_images_from_pdf_dpi_parameter(self, mock_open, mock_pdf_doc):
         """Test PDF handler uses correct DPI parameter"""
         mock_pdf_doc.__len__.return_value = 1
-        mock_image = Image.new("L", (100, 100))
+        mock_open.return_value = mock_pdf_doc
 
-        with patch("pymupdf.open", return_value=mock_pdf_doc), patch(
-            "PIL.Image.open", return_value=mock_image
-        ), patch("io.BytesIO"):
-            get_images_from_pdf("/fake/path.pdf", dpi=300)
-            mock_pdf_doc.load_page.return_value.get_pixmap.assert_called_with(dpi=300)
+        get_images_from_pdf("/fake/path.pdf", dpi=300)
+        mock_pdf_doc.load_page.return_value.get_pixmap.assert_called_with(
+            dpi=300, colorspace=pymupdf.csGRAY
+        )
 
 
 class TestTIFFHandler:
     """Test TIFF handler functionality"""
 
-    def test_get_images_from_tiff_single_frame(self):
+    def test_get_images_from_tiff_single_frame(self, tiny_gray_image):
         """Test TIFF handler with single frame TIFF"""
         mock_image = MagicMock()
         mock_image.n_frames = 1
-        mock_image.convert.return_value = Image.new("L", (100, 100))
+        mock_image.convert.return_value = tiny_gray_image
 
         with patch("PIL.Image.open", return_value=mock_image):
-            result = get_images_from_tiff("/fake/path.tiff")
+            result = list(get_images_from_tiff("/fake/path.tiff"))
             assert len(result) == 1
             assert all(isinstance(img, Image.Image) for img in result)
             mock_image.seek.assert_called_once_with(0)
 
-    def test_get_images_from_tiff_multi_frame(self):
+    def test_get_images_from_tiff_multi_frame(self, tiny_gray_image):
         """Test TIFF handler with multi-frame TIFF"""
         mock_image = MagicMock()
         mock_image.n_frames = 3
-        mock_image.convert.return_value = Image.new("L", (100, 100))
+        mock_image.convert.return_value = tiny_gray_image
 
         with patch("PIL.Image.open", return_value=mock_image):
-            result = get_images_from_tiff("/fake/path.tiff")
+            result = list(get_images_from_tiff("/fake/path.tiff"))
             assert len(result) == 3
             assert mock_image.seek.call_count == 3
 
+    def test_get_images_from_tiff_is_lazy(self, tiny_gray_image):
+        """Test TIFF frames are only decoded as they are consumed"""
+        mock_image = MagicMock()
+        mock_image.n_frames = 3
+        mock_image.convert.return_value = tiny_gray_image
+
+        with patch("PIL.Image.open", return_value=mock_image):
+            frames = get_images_from_tiff("/fake/path.tiff")
+            next(frames)
+            assert mock_image.seek.call_count == 1
+            frames.close()
+            mock_image.close.assert_called_once()
+
     def test_get_images_from_tiff_file_not_found(self):
         """Test TIFF handler with non-existent file"""
         with patch("PIL.Image.open", side_effect=FileNotFoundError("File not found")):
             with pytest.raises(ValueError, match="File not found"):
-                get_images_from_tiff("/nonexistent/path.tiff")
+                list(get_images_from_tiff("/nonexistent/path.tiff"))
 
     def test_get_images_from_tiff_corrupted_file(self):
         """Test TIFF handler with corrupted TIFF file"""
         with patch("PIL.Image.open", side_effect=Exception("Corrupted TIFF")):
             with pytest.raises(ValueError, match="Corrupted TIFF"):
-                get_images_from_tiff("/corrupted/file.tiff")
+                list(get_images_from_tiff("/corrupted/file.tiff"))
 
 
 class TestHandlerIntegration:
@@ -169,13 +186,15 @@ class TestHandlerIntegration:
     def test_pdf_handler_image_quality(self, mock_pdf_doc):
         """Test that PDF handler produces images with expected quality"""
         mock_pdf_doc.__len__.return_value = 1
-        mock_image = Image.new("L", (800, 600))
+        mock_pixmap = mock_pdf_doc.load_page.return_value.get_pixmap.return_value
+        # Non-square, so a swapped width/height would show up in img.size
+        _set_gray_samples(mock_pixmap, 80, 60)
 
-        with patch("pymupdf.open", return_value=mock_pdf_doc), patch(
-            "PIL.Image.open", return_value=mock_image
-        ), patch("io.BytesIO"):
+        with patch("pymupdf.open", return_value=mock_pdf_doc):
             result = get_images_from_pdf("/fake/path.pdf")
             assert len(result) == 1
             img = result[0]
             assert img.mode == "L"
-            assert img.size == (800, 600)
+            assert img.size == (80, 60)
+            assert img.info["dpi"] == (72, 72)
+            assert img.info["page_width_pt"] == 800
@@ -1,10 +1,30 @@
 import json
+import logging
 import os
 from unittest.mock import patch, mock_open
 
 import pytest
+from document_assessor import utils
 from src.main import main
 
+@pytest.fixture(scope="module")
+def app_logging(tmp_path_factory):
+    """
+    Lets main() configure logging once for this module, writing to a temporary
+    log directory, and shuts the log listener down when the module finishes.
+    """
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    utils._LOGGING_KEY = None
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(utils, "LOG_DIR", tmp_path_factory.mktemp("logs"))
+        yield
+        utils._stop_log_listener()
+    # The handlers main() installed are gone, so the next setup must run in full
+    utils._LOGGING_KEY = None
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
 @pytest.fixture
 def setup_test_files(tmp_path):
     """Creates temporary input and output paths for testing."""
@@ -24,7 +44,7 @@ def setup_test_files(tmp_path):
     
     return str(input_file), str(output_file), str(config_file)
 
-def test_main_success_run(setup_test_files):
+def test_main_success_run(setup_test_files, app_logging):
     """
     Test the main function for a successful run, mocking the pipeline.
     This is an end-to-end test for the application's entry point.
@@ -71,7 +91,7 @@ def test_main_success_run(setup_test_files):
     
     assert result_data == mock_output_data
 
-def test_main_input_file_not_found(setup_test_files):
+def test_main_input_file_not_found(setup_test_files, app_logging):
     """Test that the system exits gracefully if the input file does not exist."""
     _, output_path, config_path = setup_test_files
     test_args = ["main.py", "--input", "/non/existent/file.json", "--output", output_path, "--config", config_path]
@@ -82,7 +102,7 @@ def test_main_input_file_not_found(setup_test_files):
         assert e.type == SystemExit
         assert e.value.code == 1
 
-def test_main_pipeline_exception(setup_test_files):
+def test_main_pipeline_exception(setup_test_files, app_logging):
     """Test that the system exits gracefully if the pipeline raises an exception."""
     input_path, output_path, config_path = setup_test_files
     
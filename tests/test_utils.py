@@ -3,7 +3,22 @@ import os
 import json
 import logging
 from unittest.mock import patch
-from document_assessor.utils import load_json, export_metrics, setup_logging
+
+from PIL import Image
+
+from document_assessor import utils
+from document_assessor.utils import load_json, save_json, export_metrics, setup_logging, monitor_resources, cleanup_temp_files, get_image_info, log_result, is_valid_file_path, get_logger
+
+@pytest.fixture
+def isolated_root_logger(monkeypatch):
+    """Restores the root logger's handlers and level after logging setup tests."""
+    root = logging.getLogger()
+    monkeypatch.setattr(root, "handlers", list(root.handlers))
+    monkeypatch.setattr(root, "level", root.level)
+    monkeypatch.setattr('document_assessor.utils._LOGGING_KEY', None)
+    monkeypatch.setattr('document_assessor.utils._LOG_LISTENER', None)
+    yield
+    utils._stop_log_listener()
 
 def test_load_json_success(tmp_path):
     """Test loading a valid JSON input file."""
@@ -44,7 +59,7 @@ def test_export_metrics(tmp_path, monkeypatch):
     assert exported_data == metrics
 
 @patch('logging.FileHandler') # Mock FileHandler to avoid actual file creation
-def test_setup_logging(mock_file_handler, tmp_path, monkeypatch):
+def test_setup_logging(mock_file_handler, tmp_path, monkeypatch, isolated_root_logger):
     """Test the logging setup function, ensuring it writes to a temp dir."""
     # Use monkeypatch to change the LOG_DIR variable
     monkeypatch.setattr('document_assessor.utils.LOG_DIR', tmp_path)
@@ -60,4 +75,125 @@ def test_setup_logging(mock_file_handler, tmp_path, monkeypatch):
     mock_file_handler.assert_called_once()
     args, _ = mock_file_handler.call_args
     log_file_path = args[0]
-    assert str(tmp_path) in str(log_file_path)
\ No newline at end of file
+    assert str(tmp_path) in str(log_file_path)
+
+@patch('logging.FileHandler')
+def test_setup_logging_is_idempotent(mock_file_handler, tmp_path, monkeypatch, isolated_root_logger):
+    """Test that repeated setup with unchanged settings does not add handlers."""
+    monkeypatch.setattr('document_assessor.utils.LOG_DIR', tmp_path)
+
+    setup_logging()
+    handlers = list(logging.getLogger().handlers)
+    setup_logging()
+
+    mock_file_handler.assert_called_once()
+    assert logging.getLogger().handlers == handlers
+
+@patch('logging.FileHandler')
+def test_get_logger_configures_logging_once(mock_file_handler, tmp_path, monkeypatch, isolated_root_logger):
+    """Test that logging is set up lazily by the first get_logger call only."""
+    monkeypatch.setattr('document_assessor.utils.LOG_DIR', tmp_path)
+
+    get_logger("first")
+    get_logger("second")
+
+    mock_file_handler.assert_called_once()
+
+def test_save_json_non_ascii(tmp_path):
+    """Test that non-ASCII text is written as UTF-8 and round-trips."""
+    p = tmp_path / "out.json"
+    data = [{"reasons": ["Độ phân giải quá thấp"]}]
+    save_json(data, str(p))
+    assert "Độ phân giải" in p.read_text(encoding="utf-8")
+    assert load_json(str(p)) == data
+
+def test_setup_logging_writes_through_queue(tmp_path, monkeypatch, isolated_root_logger):
+    """Test that records reach the log file once the listener has drained the queue."""
+    monkeypatch.setattr('document_assessor.utils.LOG_DIR', tmp_path)
+    setup_logging({"logging": {"console_enabled": False, "file_enabled": True}})
+
+    logging.getLogger("queued").info("hello from the queue")
+    utils._stop_log_listener()
+
+    (log_file,) = tmp_path.glob("run_*.log")
+    assert "hello from the queue" in log_file.read_text(encoding="utf-8")
+
+def test_setup_logging_reconfigure_reuses_log_file(tmp_path, monkeypatch, isolated_root_logger):
+    """Test that changing settings keeps writing to the same run log file."""
+    monkeypatch.setattr('document_assessor.utils.LOG_DIR', tmp_path)
+    setup_logging({"logging": {"console_enabled": False, "level": "INFO"}})
+    setup_logging({"logging": {"console_enabled": False, "level": "DEBUG"}})
+    utils._stop_log_listener()
+
+    assert len(list(tmp_path.glob("run_*.log"))) == 1
+
+def test_monitor_resources_summary():
+    """Test that the monitor reports a peak at least as high as start/end memory."""
+    with monitor_resources("unit") as monitor:
+        monitor.sample("middle")
+        data = bytearray(8 * 1024 * 1024)
+        del data
+    summary = monitor.stop_monitoring()
+
+    assert [s["stage"] for s in summary["samples"]] == ["start_unit", "middle", "end_unit"]
+    assert summary["peak_memory_mb"] >= summary["start_memory_mb"]
+    assert summary["peak_memory_mb"] >= summary["end_memory_mb"]
+
+def test_cleanup_temp_files(tmp_path):
+    """Test that files and subdirectories are removed but the temp dir is kept."""
+    (tmp_path / "a.png").write_bytes(b"x")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.png").write_bytes(b"y")
+
+    cleanup_temp_files(str(tmp_path))
+
+    assert tmp_path.exists()
+    assert list(tmp_path.iterdir()) == []
+    # A missing directory is silently ignored
+    cleanup_temp_files(str(tmp_path / "missing"))
+
+
+def test_get_image_info_size():
+    """Test image size is derived from dimensions and band count."""
+    info = get_image_info(Image.new("RGB", (40, 30)))
+    assert info["size_bytes"] == 40 * 30 * 3
+    assert info["mode"] == "RGB"
+
+def test_log_result_single_record(caplog):
+    """Test that a rejection and all its reasons are logged as one record."""
+    with caplog.at_level(logging.INFO, logger="document_assessor.utils"):
+        log_result("d1", False, ["Too dark", "Too blurry"], ["Watermark"])
+
+    (record,) = caplog.records
+    assert record.levelno == logging.WARNING
+    assert record.getMessage().splitlines() == [
+        "Document d1 REJECTED",
+        "  - Reason for d1: Too dark",
+        "  - Reason for d1: Too blurry",
+        "  - Warning for d1: Watermark",
+    ]
+
+def test_is_valid_file_path(tmp_path):
+    """Test that only existing, readable regular files are valid."""
+    f = tmp_path / "doc.pdf"
+    f.write_bytes(b"%PDF")
+    assert is_valid_file_path(str(f)) is True
+    assert is_valid_file_path(str(tmp_path)) is False
+    assert is_valid_file_path(str(tmp_path / "missing.pdf")) is False
+    # Non-path arguments are invalid rather than an error or a file descriptor
+    assert is_valid_file_path(None) is False
+    assert is_valid_file_path(0) is False
+
+def test_get_current_process_is_shared():
+    """Test that resource monitors reuse one psutil handle for this process."""
+    assert utils.get_current_process() is utils.get_current_process()
+    assert utils.ResourceMonitor().process is utils.get_current_process()
+    assert utils.get_current_process().pid == os.getpid()
+
+def test_get_default_config_is_frozen_singleton():
+    """Test that the default config is shared and cannot be mutated."""
+    config = utils.get_default_config()
+    assert config is utils.get_default_config()
+    assert config["logging"]["level"] == "INFO"
+    with pytest.raises(TypeError):
+        config["logging"]["level"] = "DEBUG"